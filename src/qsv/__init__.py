@@ -3,7 +3,12 @@
 __version__ = "0.0.2"
 
 from .count import count, CountBuilder
+from .graph import Graph, GraphResult, TaskRecord
 from .index import index
+from .pager import Pager
+from .records import records, row_class, TypedRow
 from .sample import sample
+from .sample_stratified import sample_stratified
 from .slice import slice
+from .source import from_bytes, from_file, from_iter, Source
 from .table import table
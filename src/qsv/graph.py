@@ -0,0 +1,301 @@
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+RESOURCES = ("cpu", "io")
+
+
+@dataclass
+class Task:
+    """A node in a `Graph`."""
+
+    name: str
+    action: object
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+    resource: str = "cpu"
+
+    def execute(self):
+        if hasattr(self.action, "run"):
+            return self.action.run()
+        return self.action()
+
+    def is_up_to_date(self) -> bool:
+        """
+        Whether every output exists and is no older than every existing input (like `make`).
+        Tasks without outputs are never up to date.
+        """
+        if not self.outputs or not all(os.path.exists(path) for path in self.outputs):
+            return False
+        oldest_output = min(os.path.getmtime(path) for path in self.outputs)
+        input_times = [
+            os.path.getmtime(path) for path in self.inputs if os.path.exists(path)
+        ]
+        return not input_times or max(input_times) <= oldest_output
+
+
+@dataclass
+class TaskRecord:
+    """The outcome of a task in a `Graph` run. Times are seconds since the run started."""
+
+    name: str
+    status: str
+    start: float = 0.0
+    end: float = 0.0
+    error: BaseException | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class GraphResult:
+    """The timeline of a `Graph` run, returned by `Graph.run`."""
+
+    records: dict[str, TaskRecord]
+    critical_path: list[str]
+    wall_time: float
+
+    def timeline(self) -> str:
+        """
+        Format the run as a table of tasks ordered by start time, marking tasks on the critical path with `*`.
+        """
+        lines = [f"{'task':<24}{'status':<10}{'start':>9}{'end':>9}{'secs':>9}"]
+        for record in sorted(self.records.values(), key=lambda r: (r.start, r.name)):
+            marker = "*" if record.name in self.critical_path else " "
+            lines.append(
+                f"{marker}{record.name:<23}{record.status:<10}"
+                f"{record.start:>9.3f}{record.end:>9.3f}{record.duration:>9.3f}"
+            )
+        lines.append(f"wall time: {self.wall_time:.3f}s")
+        return "\n".join(lines)
+
+
+class Graph:
+    """
+    # qsv.Graph
+
+    Runs qsv commands as a graph of tasks. A task depends on the tasks that
+    produce its input files (and any tasks listed in `after`), independent
+    tasks run in parallel within a CPU/IO budget, and tasks whose outputs are
+    newer than their inputs are skipped like in `make`.
+
+    ## Example
+
+    Index, count and sample several files, running each file's steps in
+    parallel with the other files:
+
+    ```python
+    graph = qsv.Graph(cpu=4, io=2)
+    for path in ["a.csv", "b.csv"]:
+        graph.add(f"index {path}", qsv.index(path), inputs=[path], outputs=[f"{path}.idx"])
+        graph.add(
+            f"count {path}",
+            qsv.count(path).stdout_path(f"{path}.count"),
+            inputs=[path, f"{path}.idx"],
+            outputs=[f"{path}.count"],
+            resource="io",
+        )
+        graph.add(
+            f"sample {path}",
+            qsv.sample(100, path, seed=42, output=f"{path}.sample.csv"),
+            inputs=[path, f"{path}.idx"],
+            outputs=[f"{path}.sample.csv"],
+        )
+    result = graph.run()
+    print(result.timeline())
+    ```
+
+    Args:
+        cpu (int | None, optional): The maximum number of "cpu" tasks running at once. Must be at least 1. Defaults to the number of CPUs.
+        io (int, optional): The maximum number of "io" tasks running at once. Must be at least 1. Defaults to 2.
+    """
+
+    def __init__(self, cpu: int | None = None, io: int = 2):
+        if cpu is None:
+            cpu = os.cpu_count() or 1
+        self.budget = {"cpu": cpu, "io": io}
+        for resource, limit in self.budget.items():
+            if limit < 1:
+                raise ValueError(
+                    f"The {resource} budget must be at least 1, got {limit}."
+                )
+        self.tasks: dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        action,
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+        after: Iterable[str] = (),
+        resource: str = "cpu",
+    ):
+        """
+        Add a task to the graph.
+
+        Args:
+            name (str): A unique name for the task.
+            action (Expression | Source | Callable): What to run. Anything with a `run` method (such as a qsv command) is run with it, otherwise it is called with no arguments.
+            inputs (Iterable[str], optional): Files the task reads. The task depends on any task that outputs one of them.
+            outputs (Iterable[str], optional): Files the task writes. Used to skip the task when they are up to date. Each file can only be output by one task.
+            after (Iterable[str], optional): Names of tasks that must finish first, in addition to those found from `inputs`.
+            resource (str, optional): The budget the task counts against, "cpu" or "io". Defaults to "cpu".
+        """
+        if name in self.tasks:
+            raise ValueError(f"A task named {name!r} already exists.")
+        if resource not in RESOURCES:
+            raise ValueError(f"resource must be one of {RESOURCES}, got {resource!r}")
+        outputs = [os.fspath(path) for path in outputs]
+        for task in self.tasks.values():
+            for path in outputs:
+                if os.path.abspath(path) in map(os.path.abspath, task.outputs):
+                    raise ValueError(f"Task {task.name!r} already outputs {path!r}.")
+        self.tasks[name] = Task(
+            name,
+            action,
+            [os.fspath(path) for path in inputs],
+            outputs,
+            list(after),
+            resource,
+        )
+        return self
+
+    def dependencies(self) -> dict[str, set[str]]:
+        """
+        Map each task name to the names of the tasks it depends on.
+        """
+        producers = {}
+        for task in self.tasks.values():
+            for path in task.outputs:
+                producers[os.path.abspath(path)] = task.name
+
+        dependencies = {}
+        for task in self.tasks.values():
+            unknown = [name for name in task.after if name not in self.tasks]
+            if unknown:
+                raise ValueError(
+                    f"Task {task.name!r} runs after unknown tasks {unknown}."
+                )
+            upstream = set(task.after)
+            for path in task.inputs:
+                producer = producers.get(os.path.abspath(path))
+                if producer is not None and producer != task.name:
+                    upstream.add(producer)
+            dependencies[task.name] = upstream
+        return dependencies
+
+    def order(self) -> list[str]:
+        """
+        Return the task names in an order where every task comes after its dependencies.
+        """
+        dependencies = self.dependencies()
+        remaining = {name: set(upstream) for name, upstream in dependencies.items()}
+        order = []
+        ready = [name for name, upstream in remaining.items() if not upstream]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other, upstream in remaining.items():
+                if name in upstream:
+                    upstream.discard(name)
+                    if not upstream:
+                        ready.append(other)
+        if len(order) != len(self.tasks):
+            cycle = sorted(set(self.tasks) - set(order))
+            raise ValueError(f"The graph has a dependency cycle between {cycle}.")
+        return order
+
+    def run(self, force: bool = False) -> GraphResult:
+        """
+        Run every task that is not up to date, in parallel where possible.
+
+        If a task fails, no new tasks are started, running tasks are waited on,
+        and the first error is raised.
+
+        Args:
+            force (bool, optional): Run every task even if its outputs are up to date. Defaults to False.
+        """
+        dependencies = self.dependencies()
+        order = self.order()
+        records: dict[str, TaskRecord] = {}
+        running: dict = {}
+        in_use = {resource: 0 for resource in RESOURCES}
+        first_error: BaseException | None = None
+        clock = time.perf_counter()
+
+        def timed(task: Task) -> TaskRecord:
+            start = time.perf_counter() - clock
+            try:
+                task.execute()
+            except Exception as error:
+                return TaskRecord(
+                    task.name, "failed", start, time.perf_counter() - clock, error
+                )
+            return TaskRecord(task.name, "ran", start, time.perf_counter() - clock)
+
+        with ThreadPoolExecutor(max_workers=sum(self.budget.values())) as executor:
+            while True:
+                if first_error is None:
+                    for name in order:
+                        task = self.tasks[name]
+                        if name in records or name in running.values():
+                            continue
+                        if not all(
+                            records.get(upstream)
+                            and records[upstream].status != "failed"
+                            for upstream in dependencies[name]
+                        ):
+                            continue
+                        if not force and task.is_up_to_date():
+                            now = time.perf_counter() - clock
+                            records[name] = TaskRecord(name, "skipped", now, now)
+                            continue
+                        if in_use[task.resource] >= self.budget[task.resource]:
+                            continue
+                        in_use[task.resource] += 1
+                        running[executor.submit(timed, task)] = name
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    in_use[self.tasks[name].resource] -= 1
+                    records[name] = future.result()
+                    first_error = first_error or records[name].error
+
+        if first_error is not None:
+            raise first_error
+
+        return GraphResult(
+            records,
+            _critical_path(order, dependencies, records),
+            time.perf_counter() - clock,
+        )
+
+
+def _critical_path(
+    order: list[str],
+    dependencies: dict[str, set[str]],
+    records: dict[str, TaskRecord],
+) -> list[str]:
+    # Longest chain of dependent tasks by duration, i.e. the tasks that bound
+    # the wall time no matter how much parallelism is available.
+    finish: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+    for name in order:
+        upstream = max(dependencies[name], key=lambda n: finish[n], default=None)
+        finish[name] = records[name].duration + (finish[upstream] if upstream else 0.0)
+        previous[name] = upstream
+
+    path = []
+    name = max(order, key=lambda n: finish[n], default=None)
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return path[::-1]
@@ -0,0 +1,251 @@
+import csv
+import io
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .index import index
+
+ALIGNMENTS = ("left", "right", "center")
+
+
+def _read_index(idx_path: str) -> array:
+    # A qsv index is a sequence of big-endian u64 byte offsets, one per record
+    # (including the header row), followed by the number of records.
+    offsets = array("Q")
+    with open(idx_path, "rb") as f:
+        offsets.frombytes(f.read())
+    if sys.byteorder == "little":
+        offsets.byteswap()
+    if not offsets or offsets[-1] != len(offsets) - 1:
+        raise ValueError(f"{idx_path} is not a qsv index.")
+    offsets.pop()
+    return offsets
+
+
+def _is_fresh(idx_path: str, file_path: str) -> bool:
+    return os.path.exists(idx_path) and os.path.getmtime(idx_path) >= os.path.getmtime(
+        file_path
+    )
+
+
+def _condense(cell: str, condense: int | None) -> str:
+    # Same as `qsv table -c`: fields longer than `condense` keep that many
+    # characters followed by "...".
+    if condense and len(cell) > condense:
+        return cell[:condense] + "..."
+    return cell
+
+
+def _fit(cell: str, width: int, align: str) -> str:
+    if len(cell) > width:
+        cell = cell[: max(width - 3, 0)] + "..."[:width]
+    if align == "right":
+        return cell.rjust(width)
+    if align == "center":
+        return cell.center(width)
+    return cell.ljust(width)
+
+
+class Pager:
+    """
+    # qsv.Pager
+
+    Renders pages of a CSV file as tables for interactive viewers, without
+    starting a process for every page.
+
+    The file is indexed with `qsv.index` if it has no up-to-date index, and the
+    index is loaded once so each page is read with a single seek in a file that
+    stays open. Rendered pages are kept in an LRU cache, and the pages around
+    the last one requested are rendered in the background. Column widths are
+    computed once from the first and last `width_sample` records so they don't change
+    between pages; longer fields are cut off with "...".
+
+    ## Example
+
+    ```python
+    with qsv.Pager("fruits.csv", page_size=2) as pager:
+        print(pager.page(0))
+        print(pager.page(1))
+    ```
+
+    Output:
+
+    ```console
+    fruit       price
+    apple       2.50
+    banana      3.00
+    fruit       price
+    strawberry  1.50
+    ```
+
+    Args:
+        file_path (str): The CSV file to page through. It must be a local file.
+        page_size (int, optional): The number of records on each page, not counting the header row. Defaults to 50.
+        prefetch (int, optional): The number of pages before and after the last requested page to render in the background. Defaults to 1.
+        cache_size (int, optional): The maximum number of rendered pages to keep. Defaults to 64.
+        width (int, optional): The minimum width of each column. Defaults to 2.
+        pad (int, optional): The minimum number of spaces between each column. Defaults to 2.
+        align (str, optional): How entries should be aligned in a column: "left", "right" or "center". Defaults to "left".
+        condense (int | None, optional): Limits the length of each field to the value specified, followed by "...", like `qsv.table`.
+        width_sample (int, optional): The number of records from the start and from the end of the file used to compute column widths. Defaults to 1000.
+        delimiter (str, optional): The field delimiter for reading CSV data. Must be a single character. Defaults to ",".
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        page_size: int = 50,
+        prefetch: int = 1,
+        cache_size: int = 64,
+        width: int = 2,
+        pad: int = 2,
+        align: str = "left",
+        condense: int | None = None,
+        width_sample: int = 1000,
+        delimiter: str = ",",
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        if align not in ALIGNMENTS:
+            raise ValueError(f"align must be one of {ALIGNMENTS}, got {align!r}")
+
+        self.file_path = os.fspath(file_path)
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.cache_size = cache_size
+        self.pad = pad
+        self.align = align
+        self.condense = condense
+        self.delimiter = delimiter
+
+        idx_path = f"{self.file_path}.idx"
+        if not _is_fresh(idx_path, self.file_path):
+            index(self.file_path, run=True)
+        self._offsets = _read_index(idx_path)
+        self._file = open(self.file_path, "rb")
+        self._file_size = os.fstat(self._file.fileno()).st_size
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[int, str] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._closed = False
+
+        # Sample the start and end of the file, since fields such as IDs or
+        # dates tend to grow towards the end.
+        head_end = min(width_sample + 1, len(self._offsets))
+        tail_start = max(head_end, len(self._offsets) - width_sample)
+        sample = self._read_records(0, head_end)
+        self.header = sample[0] if sample else []
+        sample += self._read_records(tail_start, len(self._offsets))
+        self.widths = [width] * max((len(row) for row in sample), default=0)
+        for row in sample:
+            for column, cell in enumerate(row):
+                cell = _condense(cell, condense)
+                self.widths[column] = max(self.widths[column], len(cell))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.page_count
+
+    @property
+    def record_count(self) -> int:
+        """
+        The number of records in the file, not counting the header row.
+        """
+        return max(len(self._offsets) - 1, 0)
+
+    @property
+    def page_count(self) -> int:
+        """
+        The number of pages in the file.
+        """
+        return -(-self.record_count // self.page_size)
+
+    def _read_records(self, start: int, end: int) -> list[list[str]]:
+        """Read records `[start, end)`, where record 0 is the header row."""
+        if start >= end:
+            return []
+        first = self._offsets[start]
+        last = self._offsets[end] if end < len(self._offsets) else self._file_size
+        with self._lock:
+            self._file.seek(first)
+            data = self._file.read(last - first)
+        text = io.StringIO(data.decode("utf-8"), newline="")
+        return list(csv.reader(text, delimiter=self.delimiter))
+
+    def rows(self, page: int) -> list[list[str]]:
+        """
+        Return the records on a page (starting at 0), without the header row.
+        """
+        if self._closed:
+            raise ValueError("Pager is closed.")
+        if not 0 <= page < self.page_count:
+            raise IndexError(f"Page {page} out of range (0-{self.page_count - 1}).")
+        start = 1 + page * self.page_size
+        return self._read_records(
+            start, min(start + self.page_size, len(self._offsets))
+        )
+
+    def render(self, rows: list[list[str]]) -> str:
+        """
+        Format the header row and the given records as a table with the pager's column widths.
+        """
+        separator = " " * self.pad
+        lines = []
+        for row in [self.header, *rows]:
+            cells = [
+                (
+                    _fit(
+                        _condense(cell, self.condense), self.widths[column], self.align
+                    )
+                    # Like `qsv table`, the last field isn't padded.
+                    if column < min(len(row) - 1, len(self.widths))
+                    else _condense(cell, self.condense)
+                )
+                for column, cell in enumerate(row)
+            ]
+            lines.append(separator.join(cells).rstrip())
+        return "\n".join(lines)
+
+    def _render_page(self, page: int) -> str:
+        with self._cache_lock:
+            if page in self._cache:
+                self._cache.move_to_end(page)
+                return self._cache[page]
+        rendered = self.render(self.rows(page))
+        with self._cache_lock:
+            self._cache[page] = rendered
+            self._cache.move_to_end(page)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def page(self, page: int) -> str:
+        """
+        Return a page (starting at 0) rendered as a table, and start rendering the pages around it in the background.
+        """
+        if self._closed:
+            raise ValueError("Pager is closed.")
+        rendered = self._render_page(page)
+        for distance in range(1, self.prefetch + 1):
+            for neighbor in (page + distance, page - distance):
+                if 0 <= neighbor < self.page_count and neighbor not in self._cache:
+                    self._executor.submit(self._render_page, neighbor)
+        return rendered
+
+    def close(self):
+        """
+        Stop background rendering and close the file.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._file.close()
@@ -0,0 +1,305 @@
+import contextlib
+import csv
+import itertools
+import json as json_lib
+import keyword
+import os
+import re
+from collections.abc import Iterable, Iterator, Sequence
+
+from duct import Expression, StatusError
+
+ROW_TYPES = ("tuple", "dict", "typed")
+WIRE_FORMATS = ("csv", "json")
+
+
+def _field_names(header: Sequence[str]) -> list[str]:
+    names = []
+    seen = set()
+    for position, column in enumerate(header):
+        name = re.sub(r"\W", "_", column.strip()) or f"column_{position}"
+        if name[0].isdigit() or name.startswith("__"):
+            name = f"f_{name}"
+        if keyword.iskeyword(name) or hasattr(TypedRow, name):
+            name = f"{name}_"
+        base, suffix = name, 1
+        while name in seen:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _infer_converter(values: Iterable[str]):
+    values = [value for value in values if value != ""]
+    if not values:
+        return str
+    for converter in (int, float):
+        try:
+            for value in values:
+                converter(value)
+        except ValueError:
+            continue
+        return converter
+    return str
+
+
+def _lenient(converter):
+    if converter is str:
+        return None
+
+    def convert(value):
+        if value == "":
+            return None
+        if not isinstance(value, str):
+            return value
+        try:
+            return converter(value)
+        except ValueError:
+            return value
+
+    return convert
+
+
+class TypedRow:
+    """Base class for the row classes created by `row_class`."""
+
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+    _columns: tuple[str, ...] = ()
+    _converters: tuple = ()
+
+    def __init__(self, *values):
+        for name, convert, value in itertools.zip_longest(
+            self._fields, self._converters, values[: len(self._fields)]
+        ):
+            if value is None or not convert:
+                setattr(self, name, value)
+            else:
+                setattr(self, name, convert(value))
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def _asdict(self) -> dict:
+        return dict(zip(self._columns, self))
+
+
+def row_class(
+    header: Sequence[str],
+    sample: Iterable[Sequence[str]] = (),
+    name: str = "Row",
+) -> type[TypedRow]:
+    """
+    # qsv.row_class
+
+    Creates a row class with `__slots__` for the given header, inferring an
+    `int`, `float` or `str` type for each column from the `sample` rows.
+
+    Slotted rows store no per-instance `__dict__`, which keeps memory usage low
+    when materializing many rows. Empty fields become `None`, and fields that
+    do not match the inferred type are kept as strings.
+
+    ## Example
+
+    ```python
+    Row = qsv.row_class(["fruit", "price"], [["apple", "2.50"]])
+    row = Row("banana", "3.00")
+    row.price
+    ```
+
+    Output:
+
+    ```console
+    3.0
+    ```
+
+    Args:
+        header (Sequence[str]): The column names. Names that are not valid Python identifiers are sanitized for use as attributes.
+        sample (Iterable[Sequence[str]], optional): Rows used to infer the type of each column. Columns are typed as `str` if no sample is given.
+        name (str, optional): The name of the created class. Defaults to "Row".
+    """
+
+    fields = _field_names(header)
+    columns = list(zip(*sample)) if sample else []
+    converters = tuple(
+        _lenient(_infer_converter(columns[position] if position < len(columns) else ()))
+        for position in range(len(fields))
+    )
+    return type(
+        name,
+        (TypedRow,),
+        {
+            "__slots__": tuple(fields),
+            "_fields": tuple(fields),
+            "_columns": tuple(header),
+            "_converters": converters,
+        },
+    )
+
+
+def _csv_rows(expression: Expression) -> Iterator[list[str]]:
+    # Read stdout from our own pipe so that closing the iterator early can
+    # close it, which stops the process (and anything it spawned) with EPIPE.
+    read_fd, write_fd = os.pipe()
+    try:
+        handle = expression.stdout_file(write_fd).start()
+    except BaseException:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
+    finished = False
+    try:
+        with open(read_fd, encoding="utf-8", newline="") as text:
+            yield from csv.reader(text)
+        finished = True
+    finally:
+        if not finished:
+            handle.kill()
+            try:
+                handle.wait()
+            except StatusError:
+                pass
+    handle.wait()
+
+
+def _json_rows(expression: Expression) -> Iterator[list[str]]:
+    # `qsv slice --json` writes a single JSON array, which is parsed in one go.
+    records = json_lib.loads(expression.read() or "[]")
+    if not records:
+        return
+    header = list(records[0])
+    yield header
+    for record in records:
+        yield [record.get(column, "") for column in header]
+
+
+def records(
+    expression: Expression,
+    row_type: str = "tuple",
+    wire: str = "csv",
+    infer_rows: int = 100,
+    has_headers: bool = True,
+) -> Iterator:
+    """
+    # qsv.records
+
+    Runs a qsv expression and yields its output rows as Python objects instead
+    of text, so the output doesn't have to be read into a string and parsed again.
+
+    CSV output is parsed while it streams from the process. The header row is
+    consumed and used to build each row. Closing the iterator before the end
+    stops the process.
+
+    ## Examples
+
+    Assume we have a file `fruits.csv` with the following content:
+
+    ```csv
+    fruit,price
+    apple,2.50
+    banana,3.00
+    carrot,1.50
+    ```
+
+    ### Get rows as dictionaries
+
+    ```python
+    list(qsv.records(qsv.slice("fruits.csv", length=2), row_type="dict"))
+    ```
+
+    Output:
+
+    ```python
+    [{'fruit': 'apple', 'price': '2.50'}, {'fruit': 'banana', 'price': '3.00'}]
+    ```
+
+    ### Get typed rows
+
+    ```python
+    rows = list(qsv.records(qsv.slice("fruits.csv"), row_type="typed"))
+    rows[0].price
+    ```
+
+    Output:
+
+    ```console
+    2.5
+    ```
+
+    Args:
+        expression (Expression): The qsv command (or pipeline) whose output to parse.
+        row_type (str, optional): The type of each yielded row.
+            Options:
+            - "tuple": A tuple of strings.
+            - "dict": A dictionary keyed by column name.
+            - "typed": An instance of a `qsv.row_class` with column types inferred from the first `infer_rows` rows.
+            Defaults to "tuple".
+        wire (str, optional): The format the expression writes to stdout.
+            Options:
+            - "csv": CSV data with a header row.
+            - "json": A JSON array of objects, as written by `qsv.slice(..., json=True)`.
+            Defaults to "csv".
+        infer_rows (int, optional): The number of rows used to infer column types when `row_type` is "typed". Defaults to 100.
+        has_headers (bool, optional): Whether the CSV output starts with a header row. If False, the columns are named by their indices ("0", "1", ...), like the keys of `qsv.slice(..., json=True, include_header_row=False)`. Defaults to True.
+    """
+
+    if row_type not in ROW_TYPES:
+        raise ValueError(f"row_type must be one of {ROW_TYPES}, got {row_type!r}")
+    if wire not in WIRE_FORMATS:
+        raise ValueError(f"wire must be one of {WIRE_FORMATS}, got {wire!r}")
+
+    if wire == "csv":
+        rows = _csv_rows(expression)
+        if not has_headers:
+            rows = _index_header(rows)
+    else:
+        rows = _json_rows(expression)
+    return _convert_rows(rows, row_type, infer_rows)
+
+
+def _index_header(rows: Iterator[list[str]]) -> Iterator[list[str]]:
+    with contextlib.closing(rows):
+        first = next(rows, None)
+        if first is None:
+            return
+        yield [str(column) for column in range(len(first))]
+        yield first
+        yield from rows
+
+
+def _convert_rows(rows: Iterator[list[str]], row_type: str, infer_rows: int):
+    # Closing this generator early also closes `rows`, which stops the process.
+    with contextlib.closing(rows):
+        header = next(rows, None)
+        if header is None:
+            return
+
+        if row_type == "tuple":
+            yield from map(tuple, rows)
+        elif row_type == "dict":
+            for row in rows:
+                yield dict(zip(header, row))
+        else:
+            sample = list(itertools.islice(rows, infer_rows))
+            row_type_class = row_class(header, sample)
+            for row in itertools.chain(sample, rows):
+                yield row_type_class(*row)
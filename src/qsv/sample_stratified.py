@@ -0,0 +1,254 @@
+import csv
+import heapq
+import io
+import math
+import os
+import random
+import sys
+
+from .index import index
+from .pager import _is_fresh, _read_index
+from .source import from_iter
+
+
+class _Reservoir:
+    """Uniform reservoir sample of `size` items (Algorithm R)."""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        self.items = []
+
+    def offer(self, item, weight=None):
+        if self.seen < self.size:
+            self.items.append(item)
+        else:
+            position = self.rng.randrange(self.seen + 1)
+            if position < self.size:
+                self.items[position] = item
+        self.seen += 1
+
+
+class _WeightedReservoir:
+    """
+    Weighted reservoir sample of `size` items without replacement, using
+    Efraimidis and Spirakis' A-ExpJ algorithm. Once the reservoir is full,
+    exponential jumps skip over items without drawing a random number for each
+    one. Keys are kept as logarithms so small weights don't underflow.
+    """
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.heap = []
+        self.skip = None
+
+    def _random(self):
+        # random() is in [0, 1); log(0) is undefined.
+        return 1.0 - self.rng.random()
+
+    def offer(self, item, weight):
+        if weight <= 0 or self.size <= 0:
+            return
+        if len(self.heap) < self.size:
+            key = math.log(self._random()) / weight
+            heapq.heappush(self.heap, (key, item))
+            return
+
+        threshold = self.heap[0][0]
+        if self.skip is None:
+            self.skip = math.log(self._random()) / threshold
+        self.skip -= weight
+        if self.skip > 0:
+            return
+
+        low = math.exp(threshold * weight)
+        key = math.log(max(self.rng.uniform(low, 1.0), sys.float_info.min)) / weight
+        heapq.heapreplace(self.heap, (key, item))
+        self.skip = None
+
+    @property
+    def items(self):
+        return [item for _, item in self.heap]
+
+
+def _column(header: list[str], name: str) -> int:
+    try:
+        return header.index(name)
+    except ValueError:
+        raise ValueError(f"Column {name!r} not found in header {header}.") from None
+
+
+def _weight(value: str, row_number: int) -> float:
+    if value.strip() == "":
+        return 0.0
+    try:
+        weight = float(value)
+    except ValueError:
+        weight = math.nan
+    if not math.isfinite(weight):
+        raise ValueError(f"Weight {value!r} in record {row_number} is not a number.")
+    return weight
+
+
+def _index_backed_rows(file_path: str, row_numbers: list[int], delimiter: str):
+    # Seek straight to each chosen record through the file's qsv index, where
+    # offset 0 is the header row.
+    idx_path = f"{file_path}.idx"
+    if not _is_fresh(idx_path, file_path):
+        index(file_path, run=True)
+    offsets = _read_index(idx_path)
+    with open(file_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        for row_number in row_numbers:
+            first = offsets[row_number + 1]
+            last = (
+                offsets[row_number + 2] if row_number + 2 < len(offsets) else file_size
+            )
+            f.seek(first)
+            text = io.StringIO(f.read(last - first).decode("utf-8"), newline="")
+            yield next(csv.reader(text, delimiter=delimiter))
+
+
+def sample_stratified(
+    file_path: str,
+    per_group: int,
+    by: str | None = None,
+    weights: str | None = None,
+    seed: int | None = None,
+    two_pass: bool = False,
+    run: bool = False,
+    read: bool = False,
+    output: str | None = None,
+    delimiter: str = ",",
+):
+    """
+    # qsv.sample_stratified
+
+    Randomly samples up to `per_group` records from each group of records that
+    share a value in the `by` column (stratified sampling), optionally weighting
+    each record by the numeric value in the `weights` column.
+
+    The CSV data is read once as a stream, keeping one reservoir per group, so
+    memory is proportional to the number of groups times `per_group` rather than
+    to the size of the file. Uniform samples use reservoir sampling, and weighted
+    samples use the A-ExpJ algorithm (records with an empty or non-positive
+    weight are never chosen). Sampled records are output in their original
+    order, and the same `seed` always gives the same sample for the same data.
+
+    With `two_pass`, the first pass keeps only record numbers in the
+    reservoirs. The chosen records are then read by seeking to them through the
+    file's index, which is created with `qsv.index` if it is missing or out of
+    date. Use this when records are large or there are many groups.
+
+    Blank lines are skipped and are not counted as records, as in qsv.
+
+    ## Examples
+
+    Assume we have a file `fruits.csv` with the following content:
+
+    ```csv
+    fruit,color,price
+    apple,red,2.50
+    banana,yellow,3.00
+    cherry,red,4.00
+    lemon,yellow,1.00
+    ```
+
+    ### Get one random row per color
+
+    ```python
+    qsv.sample_stratified("fruits.csv", per_group=1, by="color", seed=42, run=True)
+    ```
+
+    Output:
+
+    ```console
+    fruit,color,price
+    banana,yellow,3.00
+    cherry,red,4.00
+    ```
+
+    ### Get two rows weighted by price and display them as a table
+
+    ```python
+    qsv.sample_stratified("fruits.csv", per_group=2, weights="price").pipe(qsv.table()).run()
+    ```
+
+    Args:
+        file_path (str): The CSV file to sample.
+        per_group (int): The maximum number of records to sample from each group.
+        by (str | None, optional): The column to group records by. If None, all records are sampled as one group.
+        weights (str | None, optional): A numeric column to weight records by. If None, records are sampled uniformly.
+        seed (int | None, optional): Random Number Generator (RNG) seed.
+        two_pass (bool, optional): Keep only record numbers during the first pass and read the chosen records through the file's index, indexing the file if needed. Defaults to False.
+        run (bool, optional): Write the sample to stdout. Defaults to False.
+        read (bool, optional): Return the sample as a CSV string. Defaults to False.
+        output (str | None, optional): Write the sample to a given file path instead of stdout.
+        delimiter (str, optional): The field delimiter for reading CSV data. Must be a single character. Output is always comma-delimited. Defaults to ",".
+
+    Returns:
+        If none of `run`, `read` or `output` is used, a `qsv.Source` with the sample as CSV data that can be piped into other commands.
+    """
+
+    rng = random.Random(seed)
+    reservoir_type = _WeightedReservoir if weights else _Reservoir
+    reservoirs = {}
+
+    with open(file_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, [])
+        by_column = _column(header, by) if by else None
+        weight_column = _column(header, weights) if weights else None
+        columns = [c for c in (by_column, weight_column) if c is not None]
+        min_length = max(columns, default=-1) + 1
+
+        row_number = -1
+        for row in reader:
+            if not row:
+                continue
+            row_number += 1
+            if len(row) < min_length:
+                raise ValueError(
+                    f"Record {row_number} has {len(row)} fields, "
+                    f"but at least {min_length} are needed."
+                )
+            group = row[by_column] if by_column is not None else None
+            reservoir = reservoirs.get(group)
+            if reservoir is None:
+                reservoir = reservoirs[group] = reservoir_type(per_group, rng)
+            weight = (
+                _weight(row[weight_column], row_number)
+                if weight_column is not None
+                else None
+            )
+            reservoir.offer(row_number if two_pass else (row_number, row), weight)
+
+    chosen = sorted(
+        item for reservoir in reservoirs.values() for item in reservoir.items
+    )
+    if not chosen:
+        rows = []
+    elif two_pass:
+        rows = list(_index_backed_rows(os.fspath(file_path), chosen, delimiter))
+    else:
+        rows = [row for _, row in chosen]
+
+    if output or run or read:
+        if output:
+            f = open(output, "w", newline="", encoding="utf-8")
+        elif run:
+            f = sys.stdout
+        else:
+            f = io.StringIO()
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+        if output:
+            f.close()
+        elif read:
+            return f.getvalue().rstrip("\n")
+        return None
+
+    return from_iter(rows, header=header)
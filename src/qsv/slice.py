@@ -1,5 +1,7 @@
 from duct import cmd
 
+from .records import records
+
 
 def slice(
     file_path: str = "-",
@@ -13,6 +15,7 @@ def slice(
     output: str | None = None,
     include_header_row: bool = True,
     delimiter: str | None = ",",
+    rows: str | None = None,
 ):
     """
     # qsv slice
@@ -52,6 +55,18 @@ def slice(
     banana,3.00
     ```
 
+    ### Get the first two rows as dictionaries
+
+    ```python
+    list(qsv.slice("fruits.csv", length=2, rows="dict"))
+    ```
+
+    Output:
+
+    ```python
+    [{'fruit': 'apple', 'price': '2.50'}, {'fruit': 'banana', 'price': '3.00'}]
+    ```
+
     Args:
         file_path (str): The file to run `qsv slice` on.
         run (bool, optional): Execute the command without returning its output. Defaults to False.
@@ -64,6 +79,7 @@ def slice(
         output (str | None, optional): Write output to a given file path instead of stdout.
         include_header_row (bool, optional): When set to True, the first row will be interpreted as headers. Otherwise, the first row will not appear in the output as the header row. Defaults to True.
         delimiter (bool, optional): The field delimiter for reading CSV data. Must be a single character. Defaults to `,`.
+        rows (str | None, optional): Execute the command and return an iterator of its output rows (see `qsv.records`). One of "tuple", "dict", or "typed". The output is parsed from JSON when `json` is set, otherwise it is streamed as CSV. If `include_header_row` is False, the columns are named by their indices. Can't be used with `output`.
     """
 
     args = []
@@ -86,6 +102,15 @@ def slice(
 
     slice_cmd = cmd("qsv", "slice", file_path, *args)
 
+    if rows:
+        if output:
+            raise ValueError("`rows` can't be used with `output`.")
+        return records(
+            slice_cmd,
+            row_type=rows,
+            wire="json" if json else "csv",
+            has_headers=include_header_row,
+        )
     if run:
         return slice_cmd.run()
     if read:
@@ -0,0 +1,348 @@
+import csv
+import io
+import os
+import stat
+import threading
+from collections.abc import Iterable, Sequence
+
+from duct import Expression, StatusError
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        # Blocks while the pipe buffer is full, so the producer never runs
+        # further ahead of the child than one chunk plus the pipe buffer.
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _feed_bytes(buf: bytes, chunk_size: int):
+    def feed(fd: int):
+        view = memoryview(buf)
+        for offset in range(0, len(view), chunk_size):
+            _write_all(fd, view[offset : offset + chunk_size])
+
+    return feed
+
+
+def _feed_rows(rows: Iterable[Sequence], header: Sequence[str] | None, chunk_size: int):
+    def feed(fd: int):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if header is not None:
+            writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= chunk_size:
+                _write_all(fd, buffer.getvalue().encode("utf-8"))
+                buffer.seek(0)
+                buffer.truncate()
+        _write_all(fd, buffer.getvalue().encode("utf-8"))
+
+    return feed
+
+
+def _is_regular_file(file_) -> bool:
+    # sendfile needs a seekable file on disk; pipes, sockets and ttys also
+    # have real file descriptors but are copied in chunks instead.
+    if not isinstance(getattr(file_, "raw", file_), io.FileIO):
+        return False
+    return stat.S_ISREG(os.fstat(file_.fileno()).st_mode)
+
+
+def _feed_file(file_, chunk_size: int):
+    def feed(fd: int):
+        if _is_regular_file(file_):
+            offset = file_.tell()
+            try:
+                while sent := os.sendfile(fd, file_.fileno(), offset, chunk_size):
+                    offset += sent
+                return
+            except BrokenPipeError:
+                raise
+            except OSError:
+                # sendfile isn't supported for this file; fall back to copying
+                # through userspace from wherever it stopped.
+                file_.seek(offset)
+        while chunk := file_.read(chunk_size):
+            _write_all(fd, chunk)
+
+    return feed
+
+
+class _Writer:
+    """Runs a feed function against the write end of a pipe in a background thread."""
+
+    def __init__(self, feed):
+        self.read_fd, self._write_fd = os.pipe()
+        self._feed = feed
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def _write(self):
+        try:
+            self._feed(self._write_fd)
+        except BrokenPipeError:
+            # The child exited without reading all of its input (e.g. `slice`
+            # reached the end of its range). That is not an error.
+            pass
+        except BaseException as error:
+            self._error = error
+        finally:
+            os.close(self._write_fd)
+
+    def spawned(self):
+        """Close the parent's copy of the read end once the child holds its own."""
+        if self.read_fd is not None:
+            os.close(self.read_fd)
+            self.read_fd = None
+
+    def join(self):
+        self.spawned()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+class SourceHandle:
+    """A running `Source`, returned by `Source.start`."""
+
+    def __init__(self, handle, writer: _Writer):
+        self._handle = handle
+        self._writer = writer
+
+    def wait(self):
+        """
+        Wait for the command and the input writer to finish and return the command's output.
+        """
+        output = self._handle.wait()
+        self._writer.join()
+        return output
+
+    def poll(self):
+        """
+        Return the command's output if it has finished, otherwise None.
+        """
+        output = self._handle.poll()
+        if output is not None:
+            self._writer.join()
+        return output
+
+    def kill(self):
+        """
+        Kill the command and wait for the input writer to stop.
+        """
+        self._handle.kill()
+        self._writer.join()
+
+    def pids(self):
+        """
+        Return the process IDs of the running command.
+        """
+        return self._handle.pids()
+
+
+class SourceReader(io.IOBase):
+    """A running `Source` with its stdout captured, returned by `Source.reader`."""
+
+    def __init__(self, reader, writer: _Writer):
+        self._reader = reader
+        self._writer = writer
+        self._finished = False
+
+    def readable(self):
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read from the command's stdout. Reaching EOF also waits for the input writer.
+        """
+        data = self._reader.read(size)
+        if size is None or size < 0 or not data:
+            self._finished = True
+            self._writer.join()
+        return data
+
+    def close(self):
+        """
+        Kill the command if it's still running and wait for the input writer to stop.
+        """
+        if not self.closed and not self._finished:
+            # `ReaderHandle` has no close of its own; kill the command, then
+            # read to EOF to close the pipe and reap it. The writer stops on
+            # the resulting broken pipe.
+            self._reader.kill()
+            try:
+                self._reader.read()
+            except StatusError:
+                pass
+            self._finished = True
+            self._writer.join()
+        super().close()
+
+
+class Source:
+    """
+    Python data fed to the stdin of a qsv command (or pipeline) by a background
+    thread. Create one with `qsv.from_iter`, `qsv.from_bytes` or `qsv.from_file`
+    and attach commands with `pipe`.
+    """
+
+    def __init__(self, feed, expression: Expression | None = None):
+        self._feed = feed
+        self._expression = expression
+
+    def __repr__(self):
+        return f"Source({self._expression!r})"
+
+    def pipe(self, right_side: Expression) -> "Source":
+        """
+        Pipe this source (or the output of the commands already attached to it) into another command.
+        """
+        if self._expression is None:
+            return Source(self._feed, right_side)
+        return Source(self._feed, self._expression.pipe(right_side))
+
+    def stdout_file(self, file_) -> "Source":
+        """
+        Redirect the standard output of the attached commands to the supplied file or file descriptor.
+        """
+        return Source(self._feed, self._expression.stdout_file(file_))
+
+    def _writer(self) -> _Writer:
+        if self._expression is None:
+            raise ValueError("Attach a command with `pipe` before running a source.")
+        return _Writer(self._feed)
+
+    def start(self) -> SourceHandle:
+        """
+        Start the command and the input writer and return a handle to wait on.
+        """
+        writer = self._writer()
+        try:
+            handle = self._expression.stdin_file(writer.read_fd).start()
+        finally:
+            writer.spawned()
+        return SourceHandle(handle, writer)
+
+    def reader(self) -> SourceReader:
+        """
+        Start the command with its stdout captured and return a file-like object to read it from.
+        """
+        writer = self._writer()
+        try:
+            reader = self._expression.stdin_file(writer.read_fd).reader()
+        finally:
+            writer.spawned()
+        return SourceReader(reader, writer)
+
+    def run(self):
+        """
+        Execute the command without returning its output.
+        """
+        return self.start().wait()
+
+    def read(self) -> str:
+        """
+        Execute the command and return its output.
+        """
+        with self.reader() as reader:
+            output = reader.read()
+        return output.decode("utf-8").replace("\r\n", "\n").rstrip("\n")
+
+
+def from_bytes(buf: bytes | str, chunk_size: int = CHUNK_SIZE) -> Source:
+    """
+    # qsv.from_bytes
+
+    Feeds CSV data that is already in memory to the stdin of a qsv command,
+    without writing it to a temporary file first.
+
+    ## Example
+
+    ```python
+    qsv.from_bytes(b"fruit,price\\napple,2.50\\n").pipe(qsv.count()).read()
+    ```
+
+    Output:
+
+    ```console
+    1
+    ```
+
+    Args:
+        buf (bytes | str): The CSV data. Strings are encoded as UTF-8.
+        chunk_size (int, optional): The maximum number of bytes written to the pipe at once. Defaults to 65536.
+    """
+
+    if isinstance(buf, str):
+        buf = buf.encode("utf-8")
+    return Source(_feed_bytes(buf, chunk_size))
+
+
+def from_iter(
+    rows: Iterable[Sequence],
+    header: Sequence[str] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Source:
+    """
+    # qsv.from_iter
+
+    Feeds rows produced in Python (a list, generator, etc.) as CSV data to the
+    stdin of a qsv command, without writing them to a temporary file first.
+
+    Rows are consumed lazily as the command reads its input, so a generator is
+    never run further ahead of the command than about one chunk.
+
+    ## Example
+
+    ```python
+    rows = ((f"item{i}", i) for i in range(1000))
+    qsv.from_iter(rows, header=["name", "value"]).pipe(qsv.slice(length=2)).pipe(qsv.table()).run()
+    ```
+
+    Output:
+
+    ```console
+    name   value
+    item0  0
+    item1  1
+    ```
+
+    Args:
+        rows (Iterable[Sequence]): The rows to write. Each row is a sequence of fields written with `csv.writer`.
+        header (Sequence[str] | None, optional): A header row written before `rows`. Leave as None if the first row is already the header.
+        chunk_size (int, optional): The approximate number of bytes buffered before writing to the pipe. Defaults to 65536.
+    """
+
+    return Source(_feed_rows(rows, header, chunk_size))
+
+
+def from_file(file_, chunk_size: int = CHUNK_SIZE) -> Source:
+    """
+    # qsv.from_file
+
+    Feeds an open binary file object to the stdin of a qsv command from its
+    current position, so it can be composed with `pipe` like the other sources.
+
+    Regular files are copied to the pipe in the kernel with `os.sendfile`.
+    Other file-like objects (e.g. pipes, `io.BytesIO` or a decompressing
+    reader) are copied in chunks.
+
+    ## Example
+
+    ```python
+    with gzip.open("fruits.csv.gz") as f:
+        qsv.from_file(f).pipe(qsv.count()).read()
+    ```
+
+    Args:
+        file_: A binary file object.
+        chunk_size (int, optional): The maximum number of bytes copied to the pipe at once. Defaults to 65536.
+    """
+
+    return Source(_feed_file(file_, chunk_size))
@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+import qsv
+import pytest
+from pathlib import Path
+from duct import cmd
+from .test_data import test_data
+
+
+def copy_task(graph, name, source, target, **kwargs):
+    graph.add(name, cmd("cp", source, target), [source], [target], **kwargs)
+
+
+class TestGraph:
+    @pytest.mark.parametrize(
+        "file_name",
+        ["fruits.csv"],
+    )
+    def test_dependencies(self, file_name, tmp_path: Path):
+        """Run tasks after the tasks that produce their inputs."""
+
+        source = test_data[file_name].as_posix()
+        first = tmp_path.joinpath("first.csv").as_posix()
+        second = tmp_path.joinpath("second.csv").as_posix()
+
+        graph = qsv.Graph()
+        copy_task(graph, "second", first, second)
+        copy_task(graph, "first", source, first)
+        result = graph.run()
+
+        assert graph.dependencies() == {"first": set(), "second": {"first"}}
+        assert result.records["first"].end <= result.records["second"].start
+        assert result.critical_path == ["first", "second"]
+        assert Path(second).read_text() == test_data[file_name].read_text()
+
+    @pytest.mark.parametrize(
+        "file_name",
+        ["fruits.csv"],
+    )
+    def test_skip_up_to_date(self, file_name, tmp_path: Path):
+        """Skip tasks whose outputs are newer than their inputs."""
+
+        source = tmp_path.joinpath(file_name)
+        source.write_text(test_data[file_name].read_text(), encoding="utf-8")
+        target = tmp_path.joinpath("copy.csv")
+
+        graph = qsv.Graph()
+        copy_task(graph, "copy", source.as_posix(), target.as_posix())
+
+        assert graph.run().records["copy"].status == "ran"
+        assert graph.run().records["copy"].status == "skipped"
+        assert graph.run(force=True).records["copy"].status == "ran"
+
+        mtime = target.stat().st_mtime
+        os.utime(source, (mtime + 10, mtime + 10))
+        assert graph.run().records["copy"].status == "ran"
+
+    def test_budget(self):
+        """Run independent tasks in parallel without exceeding the budget."""
+
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def task():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        graph = qsv.Graph(cpu=2)
+        for i in range(6):
+            graph.add(f"task {i}", task)
+        graph.run()
+
+        assert max(peak) == 2
+
+    def test_failure(self):
+        """Raise the first error and don't start tasks that depend on the failed task."""
+
+        ran = []
+        graph = qsv.Graph(cpu=1)
+        graph.add("fail", cmd("false"))
+        graph.add("after", lambda: ran.append("after"), after=["fail"])
+
+        with pytest.raises(Exception):
+            graph.run()
+        assert ran == []
+
+    @pytest.mark.parametrize("budget", [{"cpu": 0}, {"io": 0}])
+    def test_invalid_budget(self, budget):
+        """Reject budgets that would never run a task."""
+
+        with pytest.raises(ValueError):
+            qsv.Graph(**budget)
+
+    def test_duplicate_output(self, tmp_path: Path):
+        """Reject two tasks that write the same file."""
+
+        output = tmp_path.joinpath("out.csv").as_posix()
+        graph = qsv.Graph()
+        graph.add("a", lambda: None, outputs=[output])
+
+        with pytest.raises(ValueError):
+            graph.add("b", lambda: None, outputs=[output])
+
+    def test_cycle(self):
+        """Reject graphs with dependency cycles."""
+
+        graph = qsv.Graph()
+        graph.add("a", lambda: None, after=["b"])
+        graph.add("b", lambda: None, after=["a"])
+
+        with pytest.raises(ValueError):
+            graph.run()
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [("fruits.csv", "3")],
+    )
+    def test_index_then_count(self, file_name, expected, tmp_path: Path):
+        """Count rows of a file after indexing it."""
+
+        tmp_file = tmp_path.joinpath(file_name).resolve()
+        tmp_file.write_text(test_data[file_name].read_text(), encoding="utf-8")
+        idx_file = tmp_path.joinpath(f"{file_name}.idx").resolve()
+        count_file = tmp_path.joinpath("count.txt").resolve()
+
+        graph = qsv.Graph()
+        graph.add(
+            "count",
+            qsv.count(tmp_file.as_posix()).stdout_path(count_file),
+            inputs=[tmp_file, idx_file],
+            outputs=[count_file],
+        )
+        graph.add("index", qsv.index(tmp_file.as_posix()), [tmp_file], [idx_file])
+        graph.run()
+
+        assert count_file.read_text().strip() == expected
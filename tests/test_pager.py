@@ -0,0 +1,135 @@
+import qsv
+import pytest
+from pathlib import Path
+from .test_data import test_data
+
+
+def tmp_copy(file_name, tmp_path: Path) -> str:
+    # Make a temporary data file in a temporary directory so the index is written there
+    tmp_file = tmp_path.joinpath(file_name).resolve()
+    tmp_file.write_text(test_data[file_name].read_text(), encoding="utf-8")
+    return tmp_file.as_posix()
+
+
+class TestPager:
+    @pytest.mark.parametrize(
+        "file_name",
+        ["fruits.csv"],
+    )
+    def test_index(self, file_name, tmp_path: Path):
+        """Generate an index for the file if it doesn't have one."""
+
+        tmp_file = tmp_copy(file_name, tmp_path)
+        with qsv.Pager(tmp_file):
+            pass
+
+        assert tmp_path.joinpath(f"{file_name}.idx").exists()
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "fruits.csv",
+                [
+                    """fruit       price
+apple       2.50
+banana      3.00""",
+                    """fruit       price
+strawberry  1.50""",
+                ],
+            )
+        ],
+    )
+    def test_pages(self, file_name, expected, tmp_path: Path):
+        """Render each page as a table with the same column widths."""
+
+        with qsv.Pager(tmp_copy(file_name, tmp_path), page_size=2) as pager:
+            assert len(pager) == 2
+            assert [pager.page(0), pager.page(1)] == expected
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "fruits.csv",
+                """fruit     price
+apple     2.50
+banan...  3.00
+straw...  1.50""",
+            )
+        ],
+    )
+    def test_condense(self, file_name, expected, tmp_path: Path):
+        """Limit each field to a specific length like `qsv.table`."""
+
+        with qsv.Pager(tmp_copy(file_name, tmp_path), condense=5) as pager:
+            assert pager.page(0) == expected
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "fruits.csv",
+                """     fruit  price
+     apple  2.50
+    banana  3.00
+strawberry  1.50""",
+            )
+        ],
+    )
+    def test_align(self, file_name, expected, tmp_path: Path):
+        """Align every column but the last, which isn't padded."""
+
+        with qsv.Pager(tmp_copy(file_name, tmp_path), align="right") as pager:
+            assert pager.page(0) == expected
+
+    @pytest.mark.parametrize("align", ["left", "right", "center"])
+    @pytest.mark.parametrize(
+        "file_name",
+        ["fruits.csv"],
+    )
+    def test_matches_table(self, file_name, align, tmp_path: Path):
+        """Render a page the same way as `qsv.slice` piped into `qsv.table`."""
+
+        tmp_file = tmp_copy(file_name, tmp_path)
+        with qsv.Pager(tmp_file, page_size=3, condense=5, align=align) as pager:
+            expected = qsv.table(tmp_file, condense=5, align=align).read()
+            assert pager.page(0) == expected
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [("constituents_altnames.csv", 33971)],
+    )
+    def test_rows(self, file_name, expected, tmp_path: Path):
+        """Read the records on the last page through the index."""
+
+        tmp_file = tmp_copy(file_name, tmp_path)
+        with qsv.Pager(tmp_file, page_size=100) as pager:
+            assert pager.record_count == expected
+            last_page = pager.rows(len(pager) - 1)
+            expected_rows = qsv.slice(tmp_file, start=-len(last_page), rows="tuple")
+            assert [tuple(row) for row in last_page] == list(expected_rows)
+
+    @pytest.mark.parametrize(
+        "file_name",
+        ["fruits.csv"],
+    )
+    def test_out_of_range(self, file_name, tmp_path: Path):
+        """Raise an error for pages past the end of the file."""
+
+        with qsv.Pager(tmp_copy(file_name, tmp_path), page_size=2) as pager:
+            with pytest.raises(IndexError):
+                pager.page(2)
+
+    @pytest.mark.parametrize(
+        "file_name",
+        ["fruits.csv"],
+    )
+    def test_closed(self, file_name, tmp_path: Path):
+        """Raise an error for pages requested after the pager is closed."""
+
+        with qsv.Pager(tmp_copy(file_name, tmp_path)) as pager:
+            pager.page(0)
+
+        with pytest.raises(ValueError):
+            pager.page(0)
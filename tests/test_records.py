@@ -0,0 +1,163 @@
+import os
+import qsv
+import pytest
+from pathlib import Path
+from duct import cmd
+from .test_data import test_data
+
+
+class TestRecordsFunc:
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "fruits.csv",
+                [("apple", "2.50"), ("banana", "3.00"), ("strawberry", "1.50")],
+            )
+        ],
+    )
+    def test_tuple(self, file_name, expected):
+        """Parse CSV output into tuples of strings, without the header row."""
+
+        result = list(qsv.records(cmd("cat", test_data[file_name])))
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "fruits.csv",
+                [
+                    {"fruit": "apple", "price": "2.50"},
+                    {"fruit": "banana", "price": "3.00"},
+                    {"fruit": "strawberry", "price": "1.50"},
+                ],
+            )
+        ],
+    )
+    def test_dict(self, file_name, expected):
+        """Parse CSV output into dictionaries keyed by column name."""
+
+        result = list(qsv.records(cmd("cat", test_data[file_name]), row_type="dict"))
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [("fruits.csv", [("apple", 2.5), ("banana", 3.0), ("strawberry", 1.5)])],
+    )
+    def test_typed(self, file_name, expected):
+        """Parse CSV output into slotted rows with inferred column types."""
+
+        result = list(qsv.records(cmd("cat", test_data[file_name]), row_type="typed"))
+        assert [tuple(row) for row in result] == expected
+        assert result[0].fruit == "apple"
+        assert not hasattr(result[0], "__dict__")
+
+    def test_close_early(self, tmp_path: Path):
+        """Stop the process when the iterator is closed early."""
+
+        pid_file = tmp_path.joinpath("pid")
+        script = f"echo $$ > {pid_file}; printf 'a,b\\n1,2\\n'; exec sleep 30"
+        rows = qsv.records(cmd("sh", "-c", script))
+        assert next(rows) == ("1", "2")
+        rows.close()
+
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(pid_file.read_text()), 0)
+
+    def test_no_headers(self):
+        """Name columns by their indices when the output has no header row."""
+
+        result = list(
+            qsv.records(
+                cmd("printf", "1,2\\n3,4\\n"), row_type="dict", has_headers=False
+            )
+        )
+        assert result == [{"0": "1", "1": "2"}, {"0": "3", "1": "4"}]
+
+    def test_invalid_row_type(self):
+        """Reject unknown row types before running the command."""
+
+        with pytest.raises(ValueError):
+            qsv.records(cmd("true"), row_type="list")
+
+
+class TestRowClassFunc:
+    def test_infer_types(self):
+        """Infer int, float and str columns and map empty fields to None."""
+
+        Row = qsv.row_class(
+            ["name", "count", "ratio"], [["a", "1", "0.5"], ["b", "", "2"]]
+        )
+        row = Row("c", "3", "")
+        assert (row.name, row.count, row.ratio) == ("c", 3, None)
+        assert row._asdict() == {"name": "c", "count": 3, "ratio": None}
+
+    def test_hashable(self):
+        """Use typed rows in sets, consistently with equality."""
+
+        Row = qsv.row_class(["fruit", "price"], [["apple", "2.50"]])
+        rows = {Row("apple", "2.50"), Row("apple", "2.50"), Row("banana", "3.00")}
+        assert len(rows) == 2
+
+    def test_mismatched_value(self):
+        """Keep values that don't match the inferred type as strings."""
+
+        Row = qsv.row_class(["count"], [["1"]])
+        assert Row("n/a").count == "n/a"
+
+    def test_field_names(self):
+        """Sanitize column names that aren't valid identifiers."""
+
+        Row = qsv.row_class(["first name", "class", "1st", "first name"])
+        assert Row._fields == ("first_name", "class_", "f_1st", "first_name_2")
+
+    def test_reserved_field_names(self):
+        """Rename columns that clash with the row class's own attributes."""
+
+        Row = qsv.row_class(["_fields", "_asdict", "fruit"])
+        row = Row("a", "b", "apple")
+        assert Row._fields == ("_fields_", "_asdict_", "fruit")
+        assert row._asdict() == {"_fields": "a", "_asdict": "b", "fruit": "apple"}
+
+
+class TestSliceRows:
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [
+            (
+                "fruits.csv",
+                [
+                    {"fruit": "apple", "price": "2.50"},
+                    {"fruit": "banana", "price": "3.00"},
+                ],
+            )
+        ],
+    )
+    @pytest.mark.parametrize("json", [False, True])
+    def test_rows_dict(self, file_name, expected, json):
+        """Get a slice as dictionaries over the CSV and JSON wire formats."""
+
+        result = list(qsv.slice(test_data[file_name], length=2, json=json, rows="dict"))
+        assert result == expected
+
+    @pytest.mark.parametrize(
+        "file_name,expected",
+        [("fruits.csv", [("fruit", "price"), ("apple", "2.50")])],
+    )
+    def test_rows_no_header(self, file_name, expected):
+        """Keep the first row when the header row isn't interpreted as headers."""
+
+        result = list(
+            qsv.slice(
+                test_data[file_name], length=2, include_header_row=False, rows="tuple"
+            )
+        )
+        assert result == expected
+
+    @pytest.mark.parametrize("file_name", ["fruits.csv"])
+    def test_rows_output(self, file_name, tmp_path: Path):
+        """Reject `rows` together with `output`."""
+
+        with pytest.raises(ValueError):
+            qsv.slice(test_data[file_name], output=tmp_path / "out.csv", rows="dict")
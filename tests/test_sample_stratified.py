@@ -0,0 +1,142 @@
+import csv
+import io
+import qsv
+import pytest
+from pathlib import Path
+
+
+@pytest.fixture
+def grouped_csv(tmp_path: Path):
+    """A CSV file with 3 groups of 100 records and a weight column."""
+
+    path = tmp_path.joinpath("grouped.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["id", "group", "weight"])
+        for i in range(300):
+            writer.writerow([i, "abc"[i % 3], i % 5])
+    return path.as_posix()
+
+
+def parse(output: str):
+    return list(csv.DictReader(io.StringIO(output)))
+
+
+class TestSampleStratifiedFunc:
+    def test_per_group(self, grouped_csv):
+        """Sample the same number of records from each group, in file order."""
+
+        rows = parse(
+            qsv.sample_stratified(grouped_csv, per_group=4, by="group", read=True)
+        )
+        groups = [row["group"] for row in rows]
+        ids = [int(row["id"]) for row in rows]
+
+        assert sorted(groups) == ["a"] * 4 + ["b"] * 4 + ["c"] * 4
+        assert ids == sorted(ids)
+
+    def test_seed(self, grouped_csv):
+        """Get the same sample for the same seed."""
+
+        first = qsv.sample_stratified(
+            grouped_csv, per_group=5, by="group", seed=42, read=True
+        )
+        second = qsv.sample_stratified(
+            grouped_csv, per_group=5, by="group", seed=42, read=True
+        )
+        assert first == second
+
+    def test_weights(self, grouped_csv):
+        """Never sample records with a weight of zero."""
+
+        rows = parse(
+            qsv.sample_stratified(
+                grouped_csv,
+                per_group=10,
+                by="group",
+                weights="weight",
+                seed=1,
+                read=True,
+            )
+        )
+        assert len(rows) == 30
+        assert all(row["weight"] != "0" for row in rows)
+
+    def test_weighted_distribution(self, tmp_path: Path):
+        """Choose records in proportion to their weights."""
+
+        path = tmp_path.joinpath("weighted.csv")
+        path.write_text("id,weight\n1,1\n2,2\n3,3\n4,4\n", encoding="utf-8")
+
+        counts = {"1": 0, "2": 0, "3": 0, "4": 0}
+        for seed in range(2000):
+            result = qsv.sample_stratified(
+                path.as_posix(), per_group=1, weights="weight", seed=seed, read=True
+            )
+            counts[parse(result)[0]["id"]] += 1
+
+        for record_id, count in counts.items():
+            assert count / 2000 == pytest.approx(int(record_id) / 10, abs=0.04)
+
+    @pytest.mark.parametrize("weight", ["nan", "inf", "abc"])
+    def test_invalid_weight(self, weight, tmp_path: Path):
+        """Reject weights that aren't finite numbers."""
+
+        path = tmp_path.joinpath("invalid.csv")
+        path.write_text(f"id,weight\n1,1\n2,{weight}\n3,5\n", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            qsv.sample_stratified(path.as_posix(), per_group=1, weights="weight")
+
+    def test_small_group(self, tmp_path: Path):
+        """Keep every record of a group smaller than `per_group`."""
+
+        path = tmp_path.joinpath("small.csv")
+        path.write_text("fruit,price\napple,2.50\nbanana,3.00\n", encoding="utf-8")
+
+        result = qsv.sample_stratified(path.as_posix(), per_group=5, read=True)
+        assert result == "fruit,price\napple,2.50\nbanana,3.00"
+
+    def test_missing_column(self, grouped_csv):
+        """Reject a `by` column that isn't in the header."""
+
+        with pytest.raises(ValueError):
+            qsv.sample_stratified(grouped_csv, per_group=1, by="color")
+
+    def test_blank_lines(self, tmp_path: Path):
+        """Skip blank lines without counting them as records."""
+
+        path = tmp_path.joinpath("blank.csv")
+        path.write_text("a,b\n1,x\n\n2,y\n", encoding="utf-8")
+
+        result = qsv.sample_stratified(path.as_posix(), per_group=5, by="b", read=True)
+        assert result == "a,b\n1,x\n2,y"
+
+    def test_short_row(self, tmp_path: Path):
+        """Reject records that are missing the `by` column."""
+
+        path = tmp_path.joinpath("short.csv")
+        path.write_text("a,b\n1,x\n2\n", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            qsv.sample_stratified(path.as_posix(), per_group=1, by="b")
+
+    def test_output(self, grouped_csv, tmp_path: Path):
+        """Write the sample to a given file path."""
+
+        output = tmp_path.joinpath("sample.csv")
+        qsv.sample_stratified(
+            grouped_csv, per_group=2, by="group", output=output.as_posix()
+        )
+        assert len(parse(output.read_text())) == 6
+
+    def test_two_pass(self, grouped_csv):
+        """Get the same sample when reading the chosen records through the file's index."""
+
+        one_pass = qsv.sample_stratified(
+            grouped_csv, per_group=3, by="group", seed=7, read=True
+        )
+        two_pass = qsv.sample_stratified(
+            grouped_csv, per_group=3, by="group", seed=7, two_pass=True, read=True
+        )
+        assert one_pass == two_pass
@@ -0,0 +1,108 @@
+import io
+import subprocess
+import qsv
+import pytest
+from duct import cmd
+from .test_data import test_data
+
+
+class TestFromBytesFunc:
+    @pytest.mark.parametrize("file_name", ["fruits.csv"])
+    def test_from_bytes(self, file_name):
+        """Feed an in-memory buffer to a command's stdin."""
+
+        data = test_data[file_name].read_bytes()
+        result = qsv.from_bytes(data, chunk_size=4).pipe(cmd("cat")).read()
+        assert result == data.decode("utf-8").rstrip("\n")
+
+    @pytest.mark.parametrize("file_name,expected", [("fruits.csv", "3")])
+    def test_pipe_count(self, file_name, expected):
+        """Count rows from an in-memory buffer with `qsv.count`."""
+
+        data = test_data[file_name].read_bytes()
+        result = qsv.from_bytes(data).pipe(qsv.count()).read()
+        assert result == expected
+
+
+class TestFromIterFunc:
+    def test_from_iter(self):
+        """Write rows from a generator as CSV data."""
+
+        rows = ((f"item{i}", i) for i in range(3))
+        result = qsv.from_iter(rows, header=["name", "value"]).pipe(cmd("cat")).read()
+        assert result == "name,value\nitem0,0\nitem1,1\nitem2,2"
+
+    def test_early_exit(self):
+        """Stop writing without an error when the command exits before reading all input."""
+
+        rows = ([i] for i in range(1_000_000))
+        result = qsv.from_iter(rows).pipe(cmd("head", "-n", "2")).read()
+        assert result == "0\n1"
+
+    def test_close_reader_early(self):
+        """Stop the command and the writer when a reader is closed before EOF."""
+
+        source = qsv.from_bytes(b"x" * 10_000_000).pipe(cmd("cat"))
+        with source.reader() as reader:
+            assert reader.read(10) == b"x" * 10
+
+    def test_producer_error(self):
+        """Raise errors from the row producer when the command finishes."""
+
+        def rows():
+            yield ["fruit"]
+            raise RuntimeError("producer failed")
+
+        with pytest.raises(RuntimeError):
+            qsv.from_iter(rows()).pipe(cmd("cat")).run()
+
+    def test_records(self):
+        """Parse the output of a source pipeline with `qsv.records`."""
+
+        source = qsv.from_iter([["fruit", "price"], ["apple", "2.50"]]).pipe(cmd("cat"))
+        result = list(qsv.records(source, row_type="dict"))
+        assert result == [{"fruit": "apple", "price": "2.50"}]
+
+    @pytest.mark.parametrize(
+        "expected",
+        ["""fruit   price
+apple   2.50
+banana  3.00"""],
+    )
+    def test_pipe_slice_table(self, expected):
+        """Pipe rows from Python through `qsv.slice` and `qsv.table`."""
+
+        rows = [["apple", "2.50"], ["banana", "3.00"], ["strawberry", "1.50"]]
+        result = (
+            qsv.from_iter(rows, header=["fruit", "price"])
+            .pipe(qsv.slice(length=2))
+            .pipe(qsv.table())
+            .read()
+        )
+        assert result == expected
+
+
+class TestFromFileFunc:
+    @pytest.mark.parametrize("file_name", ["fruits.csv"])
+    def test_from_file(self, file_name):
+        """Feed an open file to a command's stdin from its current position."""
+
+        with open(test_data[file_name], "rb") as f:
+            f.readline()
+            result = qsv.from_file(f).pipe(cmd("cat")).read()
+        assert result == "apple,2.50\nbanana,3.00\nstrawberry,1.50"
+
+    def test_pipe(self):
+        """Feed a file object backed by a pipe, which can't be seeked."""
+
+        process = subprocess.Popen(["printf", "a\\nb\\n"], stdout=subprocess.PIPE)
+        with process.stdout:
+            result = qsv.from_file(process.stdout).pipe(cmd("cat")).read()
+        process.wait()
+        assert result == "a\nb"
+
+    def test_file_like(self):
+        """Feed a file-like object without a file descriptor."""
+
+        result = qsv.from_file(io.BytesIO(b"a\nb\n")).pipe(cmd("cat")).read()
+        assert result == "a\nb"